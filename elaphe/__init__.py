@@ -21,7 +21,7 @@ def load_plugins():
     for PL in DEFAULT_PLUGINS:
         try:
             __import__(PL, fromlist=[PL])
-        except ImportError, e:
+        except ImportError as e:
             import sys
             sys.stdout.write(u'Warning: %s\n' %e)
     Barcode.update_codetype_registry()
@@ -3,6 +3,8 @@ import itertools, math
 from base import Barcode, MatrixCodeRenderer, DPI
 from util import zf_bin, cap_unescape
         
+# 8-bit binary representation of every byte value.
+BYTE_BITS = [zf_bin(i, 8) for i in range(256)]
 
 AZTEC_CODE_METRICS = [
     # frmt      mlyr icap ncws  bpcw
@@ -112,8 +114,8 @@ class AztecCode(Barcode):
                         cc = zf_bin(barlen-31, 16)
                     msgbits = '11111'
                     msgbits += cc
-                    for ch in codestring:
-                        msgbits+=zf_bin(ord(ch), 8)
+                    msgbits += ''.join(
+                        [BYTE_BITS[ord(ch)&0xff] for ch in codestring])
             readerinit = self.lookup_option('readerinit')
             layers = self.lookup_option('layers')
             eclevel = self.lookup_option('eclevel')
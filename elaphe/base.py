@@ -19,8 +19,7 @@ def fb_lookup(dic, keys, default):
     for key in keys:
         if key in dic:
             return dic[key]
-    else:
-        return default
+    return default
     
 
 class Renderer(object):
@@ -45,7 +44,7 @@ class Renderer(object):
         self.render_options = kw
 
     def lookup_option(self, key, default=None):
-        fb_value = getattr(self, 'default_options').get(key, default)
+        fb_value = self.default_options.get(key, default)
         if self.options:
             return self.options.get(key, fb_value)
         return fb_value
@@ -105,10 +104,11 @@ class Renderer(object):
     def _boundingbox(self, code_bbox, text_bbox):
         text_lbx, text_lby, text_rtx, text_rty = text_bbox
         code_lbx, code_lby, code_rtx, code_rty = code_bbox
-        return (self.x_scale*(min(text_lbx, code_lbx)-self.left_margin),
-                self.y_scale*(min(text_lby, code_lby)-self.bottom_margin),
-                self.x_scale*(max(text_rtx, code_rtx)+self.right_margin),
-                self.y_scale*(max(text_rty, code_rty)+self.top_margin))
+        x_scale, y_scale = self.x_scale, self.y_scale
+        return (x_scale*(min(text_lbx, code_lbx)-self.left_margin),
+                y_scale*(min(text_lby, code_lby)-self.bottom_margin),
+                x_scale*(max(text_rtx, code_rtx)+self.right_margin),
+                y_scale*(max(text_rty, code_rty)+self.top_margin))
 
     def build_codestring(self, codestring):
         return util.ps_hex_str(codestring)
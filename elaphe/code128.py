@@ -4,7 +4,10 @@ from base import Barcode, LinearCodeRenderer, DPI
 
 
 CODE128_ESCAPE_RE = re.compile(r'\^\d{3}')
-CODE128_CHARS =" !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~"
+# an escape (^NNN) or a run of literal characters.
+CODE128_TOKEN_RE = re.compile(r'\^(\d{3})|([^^]+)')
+# code set selected by the CODE and START escapes (A: 0, B: 1, C: 2).
+CODE128_MODES = {101: 0, 103: 0, 100: 1, 104: 1, 99: 2, 105: 2}
 class Code128(Barcode):
     """
     >>> bc = Code128()
@@ -45,28 +48,46 @@ class Code128(Barcode):
             >>> r = Code128._Renderer({})
             >>> r._count_chars('^104^102Count^0990123456789^101!')
             15
+            >>> r._count_chars('^105012345^100X')
+            6
+            >>> r._count_chars('^104AB^12')
+            Traceback (most recent call last):
+            ...
+            ValueError: Invalid escape sequence at 6: '^12'
+            >>> r._count_chars('^105 12 34')
+            Traceback (most recent call last):
+            ...
+            ValueError: Invalid digits for code set C: ' 12 34'
             """
+            # Only escapes switch code sets: a literal is at most 94 in
+            # sets A/B and a digit pair at most 99 in set C.  So the
+            # string is walked escape by escape and each run of literals
+            # in between is counted as a whole.  Escapes must be exactly
+            # three digits and set C runs must be digits only; short,
+            # signed or space-padded values are rejected.
             mode = -1
             idx = 0
+            end = len(codestring)
             count = 0
-            while idx<len(codestring):
-                if codestring[idx] == '^':
-                    code_i = int(codestring[idx+1:idx+4])
-                    idx += 4
+            while idx<end:
+                m = CODE128_TOKEN_RE.match(codestring, idx)
+                if m is None:
+                    raise ValueError(
+                        'Invalid escape sequence at %d: %r'
+                        %(idx, codestring[idx:idx+4]))
+                escaped, literals = m.groups()
+                idx = m.end()
+                if escaped:
+                    mode = CODE128_MODES.get(int(escaped), mode)
+                    count+=1
+                elif mode==2:
+                    # digit pairs; an odd digit is only allowed at the end.
+                    if not literals.isdigit() or (len(literals)%2 and idx<end):
+                        raise ValueError(
+                            'Invalid digits for code set C: %r' %literals)
+                    count+=(len(literals)+1)//2
                 else:
-                    if mode==2:
-                        code_i = int(codestring[idx:idx+2])
-                        idx += 2
-                    else:
-                        code_i = CODE128_CHARS.find(codestring[idx])
-                        idx += 1
-                if code_i in (101, 103):
-                    mode = 0
-                elif code_i in (100, 104):
-                    mode = 1
-                elif code_i in (99, 105):
-                    mode = 2
-                count+=1
+                    count+=len(literals)
             return count
             
         def _code_bbox(self, codestring):
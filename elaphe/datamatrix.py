@@ -1,5 +1,6 @@
 # coding: utf-8
 import itertools
+from binascii import unhexlify
 from base import Barcode, MatrixCodeRenderer, DPI
 from util import cap_unescape
 
@@ -38,6 +39,47 @@ metrics = (
     )
 
 
+# Properties of the c40, text and x12 encodings.  Each charmap holds the
+# value of every 7-bit character (ff: not encodable), decoded once into a
+# byte table so that encoding a character is a single index operation.
+ENCODING_PROPS = dict(
+    c40=dict(
+        mode=230, eightbits=True,
+        charmap=bytearray(unhexlify(
+            '404142434445464748494a4b4c4d4e4f'
+            '505152535455565758595a5b5c5d5e5f'
+            '03808182838485868788898a8b8c8d8e'
+            '0405060708090a0b0c0d8f9091929394'
+            '950e0f101112131415161718191a1b1c'
+            '1d1e1f2021222324252627969798999a'
+            'c0c1c2c3c4c5c6c7c8c9cacbcccdcecf'
+            'd0d1d2d3d4d5d6d7d8d9dadbdcdddedf'))),
+    text=dict(
+        mode=239, eightbits=True,
+        charmap=bytearray(unhexlify(
+            '404142434445464748494a4b4c4d4e4f'
+            '505152535455565758595a5b5c5d5e5f'
+            '03808182838485868788898a8b8c8d8e'
+            '0405060708090a0b0c0d8f9091929394'
+            '95c1c2c3c4c5c6c7c8c9cacbcccdcecf'
+            'd0d1d2d3d4d5d6d7d8d9da969798999a'
+            'c00e0f101112131415161718191a1b1c'
+            '1d1e1f2021222324252627dbdcdddedf'))),
+    x12=dict(
+        mode=238, eightbits=False,
+        parsefnc=False,
+        charmap=bytearray(unhexlify(
+            'ffffffffffffffffffffffffff00ffff'
+            'ffffffffffffffffffffffffffffffff'
+            '03ffffffffffffffffff01ffffffffff'
+            '0405060708090a0b0c0dffffffff02ff'
+            'ff0e0f101112131415161718191a1b1c'
+            '1d1e1f2021222324252627ffffffffff'
+            'ffffffffffffffffffffffffffffffff'
+            'ffffffffffffffffffffffffffffffff'))),
+    )
+
+
 class DataMatrix(Barcode):
     """
     >>> bc = DataMatrix()
@@ -110,59 +152,23 @@ class DataMatrix(Barcode):
                     cw_length += len(re.findall(r'(?<!\^)\^FNC1', codestring))
                     codestring = re.sub(r'(?<!\^)\^FNC1', '', codestring)
                     codestring.replace('^^', '^')
-                residue = codestring
-                while residue:
-                    if residue[:2].isdigit():
+                # walk by index; re-slicing the remaining message on every
+                # step is quadratic in its length.
+                idx = 0
+                end = len(codestring)
+                while idx<end:
+                    if codestring[idx:idx+2].isdigit():
                         cw_length+=2
-                        residue = residue[2:]
-                        continue
-                    elif residue[0].isdigit():
-                        cw_length+=1
-                        residue = residue[1:]
+                        idx+=2
                         continue
-                    elif ord(residue[0])<128:
+                    ch = codestring[idx]
+                    if ord(ch)<128 or ch.isdigit():
                         cw_length+=1
-                        residue = residue[1:]
-                        continue
                     else:
                         cw_length+=2
-                        residue = residue[1:]
+                    idx+=1
             elif encoding in ['c40', 'text', 'x12']:
-                enc_props = dict(
-                    c40=dict(
-                        mode=230, eightbits=True,
-                        charmap=(
-                            '404142434445464748494a4b4c4d4e4f'
-                            '505152535455565758595a5b5c5d5e5f'
-                            '03808182838485868788898a8b8c8d8e'
-                            '0405060708090a0b0c0d8f9091929394'
-                            '950e0f101112131415161718191a1b1c'
-                            '1d1e1f2021222324252627969798999a'
-                            'c0c1c2c3c4c5c6c7c8c9cacbcccdcecf'
-                            'd0d1d2d3d4d5d6d7d8d9dadbdcdddedf')),
-                    text=dict(
-                        mode=239, eightbits=True,
-                        charmap=(
-                            '404142434445464748494a4b4c4d4e4f'
-                            '505152535455565758595a5b5c5d5e5f'
-                            '03808182838485868788898a8b8c8d8e'
-                            '0405060708090a0b0c0d8f9091929394'
-                            '95c1c2c3c4c5c6c7c8c9cacbcccdcecf'
-                            'd0d1d2d3d4d5d6d7d8d9da969798999a'
-                            'c00e0f101112131415161718191a1b1c'
-                            '1d1e1f2021222324252627dbdcdddedf')),
-                    x12=dict(
-                        mode=238, eightbits=False,
-                        parsefnc=False,
-                        charmap=(
-                            'ffffffffffffffffffffffffff00ffff'
-                            'ffffffffffffffffffffffffffffffff'
-                            '03ffffffffffffffffff01ffffffffff'
-                            '0405060708090a0b0c0dffffffff02ff'
-                            'ff0e0f101112131415161718191a1b1c'
-                            '1d1e1f2021222324252627ffffffffff'
-                            'ffffffffffffffffffffffffffffffff'
-                            'ffffffffffffffffffffffffffffffff')))
+                enc_props = ENCODING_PROPS[encoding]
                 parsefnc = enc_props.get('parsefnc', parsefnc)
                 mode = enc_props.get('mode')
                 eightbits = enc_props.get('eightbits')
@@ -172,22 +178,21 @@ class DataMatrix(Barcode):
                         re.findall(r'(?<!\^)\^FNC1', codestring))
                     codestring = re.sub(r'(?<!\^)\^FNC1', '', codestring)
                     codestring.replace('^^', '^')
-                residue = codestring
-                while residue:
-                    ch, residue = residue[:1], residue[1:]
+                for ch in codestring:
                     if eightbits and ord(ch)>127:
                         cw_length+=2
                         continue
-                    if 0<ord(ch)<128:
-                        m_ord = int(charmap[ord(ch)*2:ord(ch)*2+2], 16)
-                        if m_ord!=255:
-                            if ((m_ord>>6)-1)!=0:
-                                cw_length+=1
-                            else:
-                                pass
-                        else:
+                    if ord(ch)<128:
+                        m_ord = charmap[ord(ch)]
+                        if m_ord==255:
                             raise ValueError(
                                 'Invalid character in X12 encoding')
+                        # the top two bits give the shift set; characters
+                        # outside the basic set need a shift value first.
+                        if m_ord>>6==0:
+                            cw_length+=1
+                        else:
+                            cw_length+=2
                 # pad for triples
                 if (cw_length%3):
                     cw_length+=(3-cw_length%3)
@@ -216,10 +221,18 @@ class DataMatrix(Barcode):
             """
             >>> DataMatrix._Renderer(()).build_params('abcd')
             {'yscale': 1.0, 'codestring': '<61626364>', 'bbox': '0 0 24 24', 'codetype': (), 'xscale': 1.0, 'options': '<>'}
+            >>> DataMatrix._Renderer((), options=dict(encoding='c40')).build_params('ABCD')['bbox']
+            '0 0 24 24'
+            >>> DataMatrix._Renderer((), options=dict(encoding='c40')).build_params('abcdefghij'*4)['bbox']
+            '0 0 64 64'
+            >>> DataMatrix._Renderer((), options=dict(encoding='c40')).build_params('\\x01'*40)['bbox']
+            '0 0 64 64'
+            >>> DataMatrix._Renderer((), options=dict(encoding='text')).build_params('abcdefghij'*4)['bbox']
+            '0 0 44 44'
             """
             params = super(DataMatrix._Renderer, self).build_params(codestring)
-            params['bbox'] = '%d %d %d %d' %(self._boundingbox(
-                self._code_bbox(codestring), self._code_bbox(codestring)))
+            cbbox = self._code_bbox(codestring)
+            params['bbox'] = '%d %d %d %d' %self._boundingbox(cbbox, cbbox)
             return params
     renderer = _Renderer
 
@@ -1,6 +1,8 @@
 # coding: utf-8
 from base import *
 
+ISBN_DIGITS = frozenset('0123456789')
+
 
 class Ean13(Barcode):
     """
@@ -96,7 +98,8 @@ class ISBN(Barcode):
             >>> ISBN._Renderer({}).build_codestring('978 1 56592 479') # '(978-1-56592-479)'
             '<3937382d312d35363539322d343739>'
             """
-            cs = "%s%s%s-%s-%s%s%s%s%s-%s%s%s" %tuple(c for c in  codestring if c in '0123456789')
+            cs = "%s%s%s-%s-%s%s%s%s%s-%s%s%s" %tuple(
+                [c for c in codestring if c in ISBN_DIGITS])
             return super(ISBN._Renderer, self).build_codestring(cs)
     renderer = _Renderer
 
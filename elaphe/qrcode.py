@@ -145,35 +145,54 @@ QRCODE_METRIC = [
     ]
 
 
+def is_alphanumeric(s):
+    """Returns True if s consists of QR code alphanumeric characters only.
+
+    >>> is_alphanumeric('HTTP://EXAMPLE.COM/'), is_alphanumeric('Hello')
+    (True, False)
+    """
+    return not s.translate(None, '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:')
+
 def alphanumeric_or_raise(s):
     """raises ValueError if s is not alphanumeric.
     """
-    if s.translate(None, '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:'):
+    if not is_alphanumeric(s):
         raise ValueError
 
+# column of each error correction level in the QRCODE_METRIC ec lists.
+EC_LEVEL_INDEX = dict(L=0, M=1, Q=2, H=3)
+
 def qrcode_metric(msgbits, encoding=None, format_='full', eclevel=None, version=None):
     """
     >>> qrcode_metric('', version=9)
-    ('9', 53, 182)
+    ('9', 53, 100)
+    >>> qrcode_metric('', encoding='raw', eclevel='M', version=1)
+    ('1', 21, 16)
+    >>> qrcode_metric('', encoding='raw', eclevel='H', version=1)
+    ('1', 21, 9)
+    >>> qrcode_metric('', eclevel='LH')
+    Traceback (most recent call last):
+    ...
+    ValueError: Invalid error correction level: 'LH'
     """
     # logging.debug('-'*30)
     # logging.debug('msgbits=%s' % (msgbits))
     if eclevel is None:
         eclevel = 'M' if format_=='full' else 'L'
+    if eclevel not in EC_LEVEL_INDEX:
+        raise ValueError('Invalid error correction level: %r' %(eclevel,))
     if encoding is None: # 'raw' encoding should be explicit.
-        # do fallback test
-        for enc, assertion, exc in [
-            ('numeric', int, ValueError),
-            ('alphanumeric', alphanumeric_or_raise, ValueError),
-            ('kanji', codecs.lookup('sjis').decode, UnicodeDecodeError)]:
-            try:
-                assertion(msgbits)
-                encoding = enc
-                break
-            except exc:
-                pass
+        # do fallback test, without raising for the common cases.
+        if msgbits.isdigit():
+            encoding = 'numeric'
+        elif is_alphanumeric(msgbits):
+            encoding = 'alphanumeric'
         else:
-            encoding = 'byte'
+            try:
+                codecs.lookup('sjis').decode(msgbits)
+                encoding = 'kanji'
+            except UnicodeDecodeError:
+                encoding = 'byte'
     n_msgbits = 0
     if encoding=='raw': # as is
         n_msgbits = len(msgbits)
@@ -249,12 +268,17 @@ def qrcode_metric(msgbits, encoding=None, format_='full', eclevel=None, version=
         n_msgbits = len(mid)+cclen+n_msgbits
             
     # logging.debug('enc=%s fmt=%s eclv=%s ver=%s' % (encoding, format_, eclevel, version))
-    ecval = 'LHQM'.index(eclevel)
+    ecval = EC_LEVEL_INDEX[eclevel]
     if version:
         version = str(version)
     for frmt, vers, size, asp2, asp3, nmod, ecws_list, ecb_list in QRCODE_METRIC:
+        # cheap filters first; capacity is computed for candidates only.
+        if format_!=frmt:
+            continue
+        if version is not None and version!=vers:
+            continue
         ncws, rbit = divmod(nmod, 8)
-        if size in [11, 15]:
+        if size==11 or size==15:
             ncws, rbit, lc4b = ncws+1, 0, True
         else:
             lc4b = False
@@ -263,14 +287,6 @@ def qrcode_metric(msgbits, encoding=None, format_='full', eclevel=None, version=
         dmod = dcws*8
         if lc4b:
             dmod = dmod-4
-        ecb1 = ecb_list[ecval*2]
-        ecb2 = ecb_list[ecval*2+1]
-        dcpb = dcws//(ecb1+ecb2)
-        ecpb = ncws//(ecb1+ecb2)-dcpb
-        if format_!=frmt:
-            continue
-        if version not in [None, vers]:
-            continue
         if n_msgbits>dmod:
             continue
         break
@@ -282,6 +298,8 @@ def qrcode_metric(msgbits, encoding=None, format_='full', eclevel=None, version=
 
 
 ALNUM = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:'
+# reverse lookup for ALNUM, avoids scanning ALNUM for every character.
+ALNUM_INDEX = dict((ch, i) for i, ch in enumerate(ALNUM))
 def decode_n_base(s, digits=1, mode='digits'):
     """Converts string representation of arbitrary based digits into integers.
 
@@ -298,9 +316,10 @@ def decode_n_base(s, digits=1, mode='digits'):
         if mode=='alnum':
             head, tail = s[:2], s[2:]
             if len(head)==2:
-                yield (11, ALNUM.find(head[0])*45+ALNUM.find(head[1]))
+                yield (11, (ALNUM_INDEX.get(head[0], -1)*45
+                            +ALNUM_INDEX.get(head[1], -1)))
             elif len(head)==1:
-                yield (6, ALNUM.find(head[0]))
+                yield (6, ALNUM_INDEX.get(head[0], -1))
             else:
                 break
         elif mode=='digits':
@@ -42,12 +42,12 @@ class Raw(Barcode):
             [0, 0, 90, 72.0]
             """
             height = self.lookup_option('height')
-            return [0, 0, sum(int(c) for c in list(codestring)), height*DPI]
+            return [0, 0, sum(map(int, codestring)), height*DPI]
 
         def build_params(self, codestring):
             params = super(Raw._Renderer, self).build_params(codestring)
-            params['bbox'] = "%d %d %d %d" %self._boundingbox(
-                self._code_bbox(codestring), self._code_bbox(codestring))
+            cbbox = self._code_bbox(codestring)
+            params['bbox'] = "%d %d %d %d" %self._boundingbox(cbbox, cbbox)
             return params
     renderer = _Renderer
 
@@ -47,8 +47,8 @@ class Symbol(Barcode):
 
         def build_params(self, codestring):
             params = super(Symbol._Renderer, self).build_params(codestring)
-            params['bbox'] = "%d %d %d %d" %self._boundingbox(
-                self._code_bbox(codestring), self._code_bbox(codestring))
+            cbbox = self._code_bbox(codestring)
+            params['bbox'] = "%d %d %d %d" %self._boundingbox(cbbox, cbbox)
             return params
     renderer = _Renderer
 
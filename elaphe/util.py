@@ -1,7 +1,6 @@
 # coding: utf-8
 from os.path import abspath, dirname, join as pathjoin
 from binascii import hexlify
-from textwrap import TextWrapper
 import re
 
 __all__ = ['DEFAULT_PS_CODE_PATH', 'DEFAULT_DISTILL_RE',
@@ -40,22 +39,19 @@ def zf_bin(n, width):
     return bin(n)[2:].zfill(width)[0-width:]
 
 
-_cap_escape_re = re.compile(r'^\^\d\d\d')
+_cap_escape_re = re.compile(r'\^(\d\d\d)')
 def cap_unescape(msg):
     """
     >>> cap_unescape('This is ^065ztec Code')
     'This is Aztec Code'
+    >>> cap_unescape('^^065^12^256')
+    '^A^12\\x00'
     
     """
-    bits = []
-    while msg:
-        if _cap_escape_re.search(msg):
-            oct_ord, msg = msg[1:4], msg[4:]
-            bits.append(chr(int(oct_ord, 10)%256))
-        else:
-            bits.append(msg[0])
-            msg = msg[1:]
-    return ''.join(bits)
+    # single pass over msg; slicing off one character at a time is
+    # quadratic in the length of the message.
+    return _cap_escape_re.sub(
+        lambda m: chr(int(m.group(1), 10)%256), msg)
 
 
 def to_ps(obj, parlen=False):
@@ -97,7 +93,13 @@ def ps_hex_str(s):
      474657374746573742074657374200a207364666f6a736f64666a206f696a2033323430
      393837753039387275736970646a66393438333235752074657374>
     """
-    return TextWrapper(subsequent_indent=' ', width=72).fill('<'+hexlify(s)+'>')
+    # Same layout as TextWrapper(subsequent_indent=' ', width=72).fill(),
+    # which only ever has to break the literal (it has no whitespace):
+    # 72 columns on the first line, an indent and 71 on the others.
+    hex_str = '<'+hexlify(s)+'>'
+    lines = [hex_str[:72]]
+    lines.extend(' '+hex_str[i:i+71] for i in range(72, len(hex_str), 71))
+    return '\n'.join(lines)
 
 
 def dict_to_optstring(d, none=lambda x: '<>', empty=lambda x: '<>',